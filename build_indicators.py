@@ -0,0 +1,19 @@
+# Ahead-of-time build of the indicator kernels: python build_indicators.py
+# Produces indicators_aot.*.so/.pyd next to stock.py, so the first run skips JIT compilation.
+import os
+
+from numba.pycc import CC
+
+import indicators_numba as kernels
+
+cc = CC('indicators_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('sma', 'f4[:](f4[:], i8)')(kernels.sma.py_func)
+cc.export('ema', 'f4[:](f4[:], i8)')(kernels.ema.py_func)
+cc.export('rsi_wilder', 'f4[:](f4[:], i8)')(kernels.rsi_wilder.py_func)
+cc.export('macd', 'UniTuple(f4[:], 2)(f4[:], i8, i8, i8)')(kernels.macd.py_func)
+cc.export('lttb', 'i8[:](f8[:], f4[:], i8)')(kernels.lttb.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
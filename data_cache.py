@@ -0,0 +1,115 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+import pandas as pd
+import streamlit as st
+import yfinance as yf
+
+CACHE_DIR = '.cache'
+
+# Symbols like AAPL, INFY.NS, ^GSPC, EURUSD=X, BRK-B; no leading dot, so never '..'
+SYMBOL_DIR = re.compile(r'[A-Z0-9^=-][A-Z0-9.^=-]*')
+
+# Time-to-live per endpoint, in seconds
+PRICE_TTL = 24 * 60 * 60
+INFO_TTL = 7 * 24 * 60 * 60
+NEWS_TTL = 60 * 60
+
+
+# On-disk cache under .cache/{ticker}/{endpoint}_{md5(params)}.{ext}, expired by file age
+class FileCache:
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+
+    def path(self, ticker, endpoint, params, ext):
+        # Ticker is raw sidebar input: anything that is not a plain symbol gets a hashed directory
+        symbol = ticker.upper()
+        if not SYMBOL_DIR.fullmatch(symbol):
+            symbol = hashlib.md5(symbol.encode()).hexdigest()
+        key = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        path = os.path.join(self.root, symbol, f"{endpoint}_{key}.{ext}")
+        root = os.path.realpath(self.root)
+        if os.path.commonpath([root, os.path.realpath(path)]) != root:
+            raise ValueError(f"Cache path {path!r} is outside {self.root!r}")
+        return path
+
+    def is_fresh(self, path, ttl):
+        return os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl
+
+    def _replace(self, path, write):
+        # Each writer gets its own temp file (sessions are threads in one process),
+        # so readers only ever see a complete file swapped in by os.replace
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            raise
+
+    def read_json(self, path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_json(self, path, value):
+        def write(tmp):
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(value, f, default=str)
+        self._replace(path, write)
+
+    def read_frame(self, path):
+        return pd.read_parquet(path)
+
+    def write_frame(self, path, df):
+        self._replace(path, df.to_parquet)
+
+
+cache = FileCache()
+
+
+# One Ticker object (and HTTP session) per symbol for the life of the server
+@st.cache_resource
+def get_ticker(symbol):
+    return yf.Ticker(symbol)
+
+
+def cached_download(ticker, **params):
+    path = cache.path(ticker, 'download', params, 'parquet')
+    if cache.is_fresh(path, PRICE_TTL):
+        return cache.read_frame(path)
+    df = yf.download(ticker, **params)
+    # Single-ticker downloads come back with (field, ticker) columns
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    if not df.empty:
+        cache.write_frame(path, df)
+    return df
+
+
+def cached_info(ticker):
+    path = cache.path(ticker, 'info', {}, 'json')
+    if cache.is_fresh(path, INFO_TTL):
+        return cache.read_json(path)
+    info = get_ticker(ticker).info
+    if info:
+        cache.write_json(path, info)
+    return info
+
+
+def cached_news(ticker):
+    path = cache.path(ticker, 'news', {}, 'json')
+    if cache.is_fresh(path, NEWS_TTL):
+        return cache.read_json(path)
+    news = get_ticker(ticker).news
+    if news:
+        cache.write_json(path, news)
+    return news
@@ -0,0 +1,129 @@
+import numpy as np
+from numba import njit
+
+# fastmath without 'nnan'/'ninf' so the NaN checks below are not optimised away.
+# Outputs keep the input dtype (float32 in the app); running state is float64.
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+# Simple moving average with a running window sum
+@njit(cache=True, nogil=True, fastmath=FASTMATH)
+def sma(x, n):
+    out = np.empty_like(x)
+    out[:] = np.nan
+    total = 0.0
+    nans = 0
+    for i in range(x.size):
+        v = x[i]
+        if np.isnan(v):
+            nans += 1
+        else:
+            total += v
+        if i >= n:
+            old = x[i - n]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                total -= old
+        if i >= n - 1 and nans == 0:
+            out[i] = total / n
+    return out
+
+
+# Recursive exponential average seeded with the first valid value. Mirrors pandas
+# ewm(adjust=False, ignore_na=False), as used by ta: across a NaN gap the previous
+# average keeps losing weight, so the next observation counts for more than alpha.
+@njit(cache=True, nogil=True, fastmath=FASTMATH)
+def _ewm(x, alpha, min_periods):
+    out = np.empty_like(x)
+    out[:] = np.nan
+    state = np.nan
+    old_wt = 1.0
+    count = 0
+    for i in range(x.size):
+        v = x[i]
+        observed = not np.isnan(v)
+        if observed:
+            count += 1
+        if not np.isnan(state):
+            old_wt *= 1.0 - alpha
+            if observed:
+                state = (old_wt * state + alpha * v) / (old_wt + alpha)
+                old_wt = 1.0
+        elif observed:
+            state = v
+        if count >= min_periods:
+            out[i] = state
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=FASTMATH)
+def ema(x, n):
+    return _ewm(x, 2.0 / (n + 1), n)
+
+
+# RSI with Wilder (1/n) smoothing of average gain and loss
+@njit(cache=True, nogil=True, fastmath=FASTMATH)
+def rsi_wilder(x, n):
+    out = np.empty_like(x)
+    out[:] = np.nan
+    alpha = 1.0 / n
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(x.size):
+        gain = 0.0
+        loss = 0.0
+        if i > 0:
+            d = x[i] - x[i - 1]
+            if d > 0:
+                gain = d
+            elif d < 0:
+                loss = -d
+            avg_gain += alpha * (gain - avg_gain)
+            avg_loss += alpha * (loss - avg_loss)
+        if i >= n - 1:
+            if avg_loss == 0.0:
+                out[i] = 100.0
+            else:
+                out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+# MACD line and signal line from three EMA passes
+@njit(cache=True, nogil=True, fastmath=FASTMATH)
+def macd(x, fast=12, slow=26, signal=9):
+    line = ema(x, fast) - ema(x, slow)
+    return line, ema(line, signal)
+
+
+# Largest-Triangle-Three-Buckets: indices of n_out points that keep the visual shape
+@njit(cache=True, nogil=True, fastmath=FASTMATH)
+def lttb(x, y, n_out):
+    size = x.size
+    if n_out >= size or n_out < 3:
+        return np.arange(size)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = size - 1
+    every = (size - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third triangle vertex
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, size)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= avg_end - avg_start
+        avg_y /= avg_end - avg_start
+
+        max_area = -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                out[i + 1] = j
+        a = out[i + 1]
+    return out
@@ -0,0 +1,26 @@
+import numpy as np
+
+
+# Aggregate rows sharing a bucket id into one bar: open=first, high=max, low=min, close=last.
+# Rows must be sorted by date; each bar is labelled with the date of its first row.
+def bucket_ohlc(dates, ohlc, buckets):
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], buckets.size] - 1
+    bars = np.column_stack([
+        ohlc[starts, 0],
+        np.maximum.reduceat(ohlc[:, 1], starts),
+        np.minimum.reduceat(ohlc[:, 2], starts),
+        ohlc[ends, 3],
+    ])
+    return dates[starts], bars
+
+
+# Monday-to-Sunday weeks
+def weekly_ohlc(dates, ohlc):
+    # 1970-01-01 was a Thursday, so shifting by 3 days starts each bucket on Monday
+    return bucket_ohlc(dates, ohlc, (dates.astype('datetime64[D]').astype(np.int64) + 3) // 7)
+
+
+# Calendar months
+def monthly_ohlc(dates, ohlc):
+    return bucket_ohlc(dates, ohlc, dates.astype('datetime64[M]').astype(np.int64))
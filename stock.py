@@ -1,9 +1,16 @@
+from types import SimpleNamespace
+
 import streamlit as st
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import ta
-from textblob import TextBlob
+from data_cache import PRICE_TTL, cached_download, cached_info, cached_news
+from ohlc import weekly_ohlc, monthly_ohlc
+try:
+    # Ahead-of-time build from build_indicators.py, when present
+    from indicators_aot import sma, ema, rsi_wilder, macd, lttb
+except ImportError:
+    from indicators_numba import sma, ema, rsi_wilder, macd, lttb
 
 # Page config
 st.set_page_config(page_title="Stock Market Analysis", layout="wide")
@@ -45,13 +52,27 @@ indicators = st.sidebar.multiselect(
     default=['SMA (20)', 'RSI']
 )
 
-# Load stock data
-@st.cache_data
-def load_data(ticker, start, end):
-    df = yf.download(ticker, start=start, end=end)
+# Load stock data: full history is cached per ticker, date changes only re-slice it
+@st.cache_data(ttl=PRICE_TTL)
+def load_full(ticker):
+    df = cached_download(ticker, period='max')
+    # Raising keeps a failed or empty download out of st.cache_data, so the next rerun retries
+    if df.empty:
+        raise ValueError(f"No price data returned for {ticker}")
     df.reset_index(inplace=True)
     return df
 
+def load_data(ticker, start, end):
+    try:
+        df = load_full(ticker)
+    except ValueError:
+        return pd.DataFrame(columns=['Date', 'Open', 'High', 'Low', 'Close', 'Volume'])
+    # A failed download has no 'Date' column; the checks below report it
+    if df.empty or 'Date' not in df:
+        return df
+    in_range = (df['Date'] >= pd.Timestamp(start)) & (df['Date'] < pd.Timestamp(end))
+    return df[in_range].reset_index(drop=True)
+
 data = load_data(ticker, start_date, end_date)
 
 # Defensive check
@@ -59,86 +80,145 @@ if 'Close' not in data.columns:
     st.error("❌ 'Close' column not found in data.")
     st.stop()
 
-close_col = pd.to_numeric(data['Close'].squeeze(), errors='coerce')
-if close_col.isnull().all():
+# Coerce all price columns in one pass; the indicators read Close from the same block
+prices = data[['Open', 'High', 'Low', 'Close']].apply(pd.to_numeric, errors='coerce').to_numpy(np.float32)
+close = np.ascontiguousarray(prices[:, 3])
+if np.isnan(close).all():
     st.error("❌ 'Close' price data is invalid or missing for this stock.")
     st.stop()
+dates = data['Date'].to_numpy()
 
-# Apply technical indicators
+# Rows with any missing price are not drawn
+mask = np.isfinite(prices).all(axis=1)
+if not mask.any():
+    st.error("❌ OHLC price data is invalid or missing for this stock.")
+    st.stop()
+ohlc_arr = prices[mask]
+ohlc_dates = dates[mask]
+
+# Latest finite value of an indicator array, as a plain float
+def last_finite(values):
+    values = values[np.isfinite(values)]
+    return float(values[-1]) if values.size else None
+
+# Values read by the insights section
+insights = SimpleNamespace(latest_rsi=None, macd_curr=None, signal_curr=None)
+
+# Apply technical indicators (collected first, joined onto data in one step)
+indicator_cols = {}
 if 'SMA (20)' in indicators:
-    data['SMA20'] = ta.trend.sma_indicator(close=close_col, window=20)
+    indicator_cols['SMA20'] = sma(close, 20)
 
 if 'EMA (20)' in indicators:
-    data['EMA20'] = ta.trend.ema_indicator(close=close_col, window=20)
+    indicator_cols['EMA20'] = ema(close, 20)
 
 if 'RSI' in indicators:
-    data['RSI'] = ta.momentum.rsi(close=close_col, window=14)
+    rsi_arr = rsi_wilder(close, 14)
+    indicator_cols['RSI'] = rsi_arr
+    insights.latest_rsi = last_finite(rsi_arr)
 
-# MACD Handling
-macd_curr = signal_curr = None
+# MACD Handling: the signal line needs 26 + 9 - 1 valid closes before its first value
+MACD_MIN_POINTS = 34
 if 'MACD' in indicators:
-    try:
-        macd_obj = ta.trend.macd(close=close_col)
-        data['MACD'] = macd_obj.macd()
-        data['Signal_Line'] = macd_obj.macd_signal()
-        if data['MACD'].isnull().all() or data['Signal_Line'].isnull().all():
-            st.warning("⚠️ MACD could not be computed due to insufficient data.")
-            data['MACD'] = data['Signal_Line'] = None
-        else:
-            macd_curr = data['MACD'].iloc[-1]
-            signal_curr = data['Signal_Line'].iloc[-1]
-    except Exception as e:
-        st.warning(f"⚠️ MACD calculation error: {e}")
-        data['MACD'] = data['Signal_Line'] = None
-
-# Price chart
+    if np.isfinite(close).sum() < MACD_MIN_POINTS:
+        st.info(f"Not enough data for MACD (need ≥{MACD_MIN_POINTS} points).")
+    else:
+        macd_line, signal_line = macd(close, 12, 26, 9)
+        indicator_cols['MACD'] = macd_line
+        indicator_cols['Signal_Line'] = signal_line
+        insights.macd_curr = last_finite(macd_line)
+        insights.signal_curr = last_finite(signal_line)
+
+if indicator_cols:
+    data = pd.concat([data, pd.DataFrame(indicator_cols, index=data.index)], axis=1)
+
+# Chart downsampling: send at most MAX_POINTS points per trace to the browser
+MAX_POINTS = 2000
+
+def lttb_rows(values):
+    rows = np.flatnonzero(np.isfinite(values))
+    if rows.size > MAX_POINTS:
+        rows = rows[lttb(rows.astype(np.float64), values[rows], MAX_POINTS)]
+    return rows
+
+def line_xy(col):
+    values = data[col].to_numpy(dtype=np.float32, na_value=np.nan)
+    rows = lttb_rows(values)
+    return dates[rows], values[rows]
+
+# Long ranges draw weekly candles instead (monthly if there are still more than
+# MAX_POINTS weeks), bucketed by ohlc.py
+MAX_CANDLES = 800
+
+PRICE_FIG_CACHE_ENTRIES = 32
+
+# Price chart: the Figure object itself is cached, so an identical rerun skips building it.
+# It is shared across sessions and must not be mutated after it is returned.
+@st.cache_resource(max_entries=PRICE_FIG_CACHE_ENTRIES)
+def build_price_fig(ohlc_dates, ohlc_arr, dates, overlays):
+    candle_dates, candle_arr = ohlc_dates, ohlc_arr
+    if len(ohlc_arr) > MAX_CANDLES:
+        candle_dates, candle_arr = weekly_ohlc(ohlc_dates, ohlc_arr)
+        if len(candle_arr) > MAX_POINTS:
+            candle_dates, candle_arr = monthly_ohlc(ohlc_dates, ohlc_arr)
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(
+        x=candle_dates,
+        open=candle_arr[:, 0],
+        high=candle_arr[:, 1],
+        low=candle_arr[:, 2],
+        close=candle_arr[:, 3],
+        name='Candlestick'
+    ))
+    for name, (values, color) in overlays.items():
+        rows = lttb_rows(values)
+        fig.add_trace(go.Scattergl(x=dates[rows], y=values[rows], name=name, line=dict(color=color)))
+    fig.update_layout(xaxis_rangeslider_visible=False, height=600)
+    return fig
+
 st.subheader(f"Price Chart for {ticker.upper()}")
-fig = go.Figure()
-fig.add_trace(go.Candlestick(
-    x=data['Date'],
-    open=data['Open'],
-    high=data['High'],
-    low=data['Low'],
-    close=data['Close'],
-    name='Candlestick'
-))
+overlays = {}
 if 'SMA (20)' in indicators and 'SMA20' in data:
-    fig.add_trace(go.Scatter(x=data['Date'], y=data['SMA20'], name='SMA (20)', line=dict(color='blue')))
+    overlays['SMA (20)'] = (data['SMA20'].to_numpy(), 'blue')
 if 'EMA (20)' in indicators and 'EMA20' in data:
-    fig.add_trace(go.Scatter(x=data['Date'], y=data['EMA20'], name='EMA (20)', line=dict(color='orange')))
-fig.update_layout(xaxis_rangeslider_visible=False, height=600)
+    overlays['EMA (20)'] = (data['EMA20'].to_numpy(), 'orange')
+fig = build_price_fig(ohlc_dates, ohlc_arr, dates, overlays)
 st.plotly_chart(fig, use_container_width=True)
 
 # RSI chart
 if 'RSI' in indicators and 'RSI' in data:
     st.subheader("RSI (Relative Strength Index)")
     fig_rsi = go.Figure()
-    fig_rsi.add_trace(go.Scatter(x=data['Date'], y=data['RSI'], line=dict(color='purple'), name='RSI'))
+    x, y = line_xy('RSI')
+    fig_rsi.add_trace(go.Scattergl(x=x, y=y, line=dict(color='purple'), name='RSI'))
     fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
     fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
     fig_rsi.update_layout(height=300)
     st.plotly_chart(fig_rsi, use_container_width=True)
 
 # MACD chart
-if 'MACD' in indicators and 'MACD' in data and data['MACD'] is not None:
+if 'MACD' in indicators and 'MACD' in data:
     st.subheader("MACD")
     fig_macd = go.Figure()
-    fig_macd.add_trace(go.Scatter(x=data['Date'], y=data['MACD'], name='MACD', line=dict(color='blue')))
-    fig_macd.add_trace(go.Scatter(x=data['Date'], y=data['Signal_Line'], name='Signal Line', line=dict(color='red')))
+    x, y = line_xy('MACD')
+    fig_macd.add_trace(go.Scattergl(x=x, y=y, name='MACD', line=dict(color='blue')))
+    x, y = line_xy('Signal_Line')
+    fig_macd.add_trace(go.Scattergl(x=x, y=y, name='Signal Line', line=dict(color='red')))
     fig_macd.update_layout(height=300)
     st.plotly_chart(fig_macd, use_container_width=True)
 
 # Key metrics
 st.subheader("📊 Key Metrics")
 col1, col2, col3 = st.columns(3)
-col1.metric("Latest Close", f"${float(data['Close'].iloc[-1]):.2f}")
-col2.metric("52W High", f"${float(data['High'].max()):.2f}")
-col3.metric("52W Low", f"${float(data['Low'].min()):.2f}")
+# Read in float64: the float32 chart block is only cent-accurate below ~$167k (e.g. not BRK-A)
+chl = data[['Close', 'High', 'Low']].to_numpy(np.float64, na_value=np.nan)[mask]
+col1.metric("Latest Close", f"${chl[-1, 0]:.2f}")
+col2.metric("52W High", f"${chl[:, 1].max():.2f}")
+col3.metric("52W Low", f"${chl[:, 2].min():.2f}")
 
 # Fundamental ratios
 st.subheader("📘 Fundamental Ratio Analysis")
-ticker_obj = yf.Ticker(ticker)
-info = ticker_obj.info
+info = cached_info(ticker)
 
 col4, col5, col6 = st.columns(3)
 col4.metric("P/E Ratio", f"{info.get('trailingPE', 'N/A')}")
@@ -152,41 +232,49 @@ col9.metric("Market Cap", f"${info.get('marketCap', 0):,.0f}")
 
 # Investment strategy insights
 st.subheader("💡 Investment Insights")
-if 'RSI' in indicators and 'RSI' in data:
-    latest_rsi = data['RSI'].iloc[-1]
-    if latest_rsi > 70:
+if insights.latest_rsi is not None:
+    if insights.latest_rsi > 70:
         st.warning("RSI indicates the stock is overbought – Consider waiting for a dip.")
-    elif latest_rsi < 30:
+    elif insights.latest_rsi < 30:
         st.success("RSI indicates the stock is oversold – Potential buying opportunity.")
     else:
         st.info("RSI indicates neutral condition.")
 
-if macd_curr is not None and signal_curr is not None:
-    if pd.notnull(macd_curr) and pd.notnull(signal_curr):
-        if macd_curr > signal_curr:
-            st.success("MACD crossover suggests a bullish signal.")
-        elif macd_curr < signal_curr:
-            st.warning("MACD crossover suggests a bearish signal.")
-        else:
-            st.info("MACD is flat – No clear trend.")
+if insights.macd_curr is not None and insights.signal_curr is not None:
+    if insights.macd_curr > insights.signal_curr:
+        st.success("MACD crossover suggests a bullish signal.")
+    elif insights.macd_curr < insights.signal_curr:
+        st.warning("MACD crossover suggests a bearish signal.")
     else:
-        st.info("MACD signal not available due to null values.")
+        st.info("MACD is flat – No clear trend.")
 
 # Raw data
 with st.expander("📋 View Raw Data"):
-    st.dataframe(data.tail(100))
+    raw_cols = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    price_dtypes = {'Open': 'float32', 'High': 'float32', 'Low': 'float32', 'Close': 'float32'}
+    st.dataframe(data.tail(100)[raw_cols].astype(price_dtypes))
 
 # Sentiment analysis
+@st.cache_resource
+def get_vader():
+    # Imported here so sessions without news never load the VADER lexicon
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
 st.subheader("🗞️ News Sentiment Analysis")
 try:
-    news = ticker_obj.news
-    if news:
-        for i in range(min(5, len(news))):
-            headline = news[i]['title']
-            sentiment = TextBlob(headline).sentiment.polarity
-            if sentiment > 0.1:
+    news = cached_news(ticker) or []
+    # Newer yfinance nests the headline under 'content'; older versions keep it top-level.
+    # Yahoo often repeats a headline across publishers; score each title once
+    titles = (item.get('content', item).get('title') for item in news[:5])
+    headlines = list(dict.fromkeys(title for title in titles if title))
+    if headlines:
+        analyzer = get_vader()
+        scores = [analyzer.polarity_scores(headline)['compound'] for headline in headlines]
+        for headline, sentiment in zip(headlines, scores):
+            if sentiment >= 0.05:
                 st.success(f"🔼 {headline}")
-            elif sentiment < -0.1:
+            elif sentiment <= -0.05:
                 st.error(f"🔻 {headline}")
             else:
                 st.info(f"➖ {headline}")
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from data_cache import FileCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FileCache(str(tmp_path))
+
+
+def test_path_stays_under_root(cache, tmp_path):
+    path = cache.path('../../x', 'info', {}, 'json')
+    assert os.path.commonpath([str(tmp_path), os.path.realpath(path)]) == str(tmp_path)
+    assert os.path.dirname(os.path.dirname(path)) == str(tmp_path)
+
+
+@pytest.mark.parametrize('ticker, directory', [('infy.ns', 'INFY.NS'), ('brk-b', 'BRK-B'), ('^gspc', '^GSPC')])
+def test_symbol_keeps_readable_directory(cache, tmp_path, ticker, directory):
+    path = cache.path(ticker, 'download', {'period': 'max'}, 'parquet')
+    assert os.path.dirname(path) == os.path.join(str(tmp_path), directory)
+
+
+def test_failed_write_leaves_no_temp_file(cache, tmp_path):
+    path = cache.path('AAPL', 'info', {}, 'json')
+
+    def write(tmp):
+        with open(tmp, 'w') as f:
+            f.write('partial')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        cache._replace(path, write)
+    assert os.listdir(os.path.dirname(path)) == []
+    assert not os.path.exists(path)
@@ -0,0 +1,108 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators_numba import sma, ema, rsi_wilder, macd, lttb
+
+
+# References use the same pandas formulas as ta (fillna=False)
+def ref_sma(x, n):
+    return pd.Series(x).rolling(n, min_periods=n).mean().to_numpy()
+
+
+def ref_ema(x, n):
+    return pd.Series(x).ewm(span=n, min_periods=n, adjust=False).mean().to_numpy()
+
+
+def ref_rsi(x, n):
+    diff = pd.Series(x).diff(1)
+    up = diff.where(diff > 0, 0.0).ewm(alpha=1 / n, min_periods=n, adjust=False).mean()
+    down = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / n, min_periods=n, adjust=False).mean()
+    rsi = pd.Series(np.where(down == 0, 100, 100 - 100 / (1 + up / down)))
+    return rsi.where(up.notna()).to_numpy()
+
+
+def ref_macd(x, fast, slow, signal):
+    line = pd.Series(ref_ema(x, fast) - ref_ema(x, slow))
+    return line.to_numpy(), line.ewm(span=signal, min_periods=signal, adjust=False).mean().to_numpy()
+
+
+@pytest.fixture
+def close():
+    return 100 + np.cumsum(np.random.default_rng(0).normal(size=3000))
+
+
+def assert_matches(actual, expected, rtol, atol=0.0):
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+
+
+# float32 rounding of ~100 prices is ~1e-5 absolute, which matters for MACD values near zero
+@pytest.mark.parametrize('dtype, rtol, atol', [(np.float64, 1e-9, 0.0), (np.float32, 1e-5, 1e-4)])
+def test_kernels_match_ta_formulas(close, dtype, rtol, atol):
+    x = close.astype(dtype)
+    assert_matches(sma(x, 20), ref_sma(close, 20), rtol, atol)
+    assert_matches(ema(x, 20), ref_ema(close, 20), rtol, atol)
+    assert_matches(rsi_wilder(x, 14), ref_rsi(close, 14), rtol, atol)
+    line, signal = macd(x, 12, 26, 9)
+    ref_line, ref_signal = ref_macd(close, 12, 26, 9)
+    assert_matches(line, ref_line, rtol, atol)
+    assert_matches(signal, ref_signal, rtol, atol)
+
+
+def test_warm_up_lengths(close):
+    assert np.flatnonzero(~np.isnan(sma(close, 20)))[0] == 19
+    assert np.flatnonzero(~np.isnan(ema(close, 20)))[0] == 19
+    assert np.flatnonzero(~np.isnan(rsi_wilder(close, 14)))[0] == 13
+    assert np.flatnonzero(~np.isnan(macd(close, 12, 26, 9)[1]))[0] == 33
+
+
+def test_sma_window_with_nan(close):
+    close[[5, 700]] = np.nan
+    assert_matches(sma(close, 20), ref_sma(close, 20), 1e-9)
+
+
+def test_ema_and_macd_across_nan_gaps(close):
+    close[[40, 41, 120, 700]] = np.nan
+    assert_matches(ema(close, 20), ref_ema(close, 20), 1e-9)
+    line, signal = macd(close, 12, 26, 9)
+    ref_line, ref_signal = ref_macd(close, 12, 26, 9)
+    assert_matches(line, ref_line, 1e-9, 1e-9)
+    assert_matches(signal, ref_signal, 1e-9, 1e-9)
+
+
+def test_rsi_is_100_without_losses():
+    assert rsi_wilder(np.arange(30, dtype=np.float64), 14)[-1] == 100.0
+
+
+def test_lttb_keeps_endpoints_and_order(close):
+    idx = lttb(np.arange(close.size, dtype=np.float64), close.astype(np.float32), 500)
+    assert idx.size == 500
+    assert idx[0] == 0 and idx[-1] == close.size - 1
+    assert (np.diff(idx) > 0).all()
+
+
+@pytest.fixture(scope='module')
+def aot(tmp_path_factory):
+    pytest.importorskip('numba.pycc')
+    import build_indicators
+    build_indicators.cc.output_dir = str(tmp_path_factory.mktemp('aot'))
+    build_indicators.cc.compile()
+    spec = importlib.util.spec_from_file_location(
+        'indicators_aot', os.path.join(build_indicators.cc.output_dir, build_indicators.cc.output_file)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# The AOT build is compiled without the JIT fastmath flags, so floats may differ in the last bits
+def test_aot_matches_jit(aot, close):
+    x = close.astype(np.float32)
+    for name, args in [('sma', (20,)), ('ema', (20,)), ('rsi_wilder', (14,)), ('macd', (12, 26, 9))]:
+        np.testing.assert_allclose(getattr(aot, name)(x, *args), globals()[name](x, *args), rtol=1e-6, equal_nan=True)
+    rows = np.arange(x.size, dtype=np.float64)
+    np.testing.assert_array_equal(aot.lttb(rows, x, 500), lttb(rows, x, 500))
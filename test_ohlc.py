@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ohlc import weekly_ohlc, monthly_ohlc
+
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+
+
+@pytest.fixture
+def daily():
+    index = pd.bdate_range('1980-01-01', periods=11700)
+    prices = np.random.default_rng(1).random((index.size, 4)).astype(np.float32) * 100
+    return pd.DataFrame(prices, columns=list(AGG), index=index)
+
+
+@pytest.mark.parametrize('bucket, rule', [(weekly_ohlc, 'W-SUN'), (monthly_ohlc, 'MS')])
+def test_matches_pandas_resample(daily, bucket, rule):
+    dates, bars = bucket(daily.index.to_numpy(), daily.to_numpy())
+    expected = daily.resample(rule).agg(AGG).dropna()
+    np.testing.assert_array_equal(bars, expected.to_numpy())
+    # Bars are labelled with their first trading day, which falls in the resample bin
+    first_days = daily.index.to_series().resample(rule).first().dropna().to_numpy()
+    np.testing.assert_array_equal(dates, first_days)
+
+
+def test_weeks_start_on_monday(daily):
+    dates, _ = weekly_ohlc(daily.index.to_numpy(), daily.to_numpy())
+    assert (pd.DatetimeIndex(dates[1:]).dayofweek == 0).all()